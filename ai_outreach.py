@@ -1,53 +1,94 @@
+import asyncio
+import functools
+import logging
+import hashlib
 import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+import json_repair
 import pandas as pd
-import json
+import orjson
 import os
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from outreach_cache import OutreachTemplateCache
+
+logger = logging.getLogger(__name__)
+
+# Serves near-duplicate leads (same business type / state / contact
+# seniority) from locally stored templates instead of re-calling Gemini.
+_TEMPLATE_CACHE = OutreachTemplateCache()
+
+# Remembers the key the client was last configured with so repeated calls
+# (one per bulk-outreach entry) don't reconfigure the SDK needlessly.
+_configured_key = None
 
 def configure_gemini(api_key):
-    """Configures the Gemini client with the provided API key."""
+    """Configures the Gemini client with the provided API key (idempotent)."""
+    global _configured_key, _cached_content, _cache_expires_at, _cache_disabled_until
+    if api_key is not None and api_key == _configured_key:
+        return True
     try:
         genai.configure(api_key=api_key)
+        if _configured_key is not None:
+            # GenerativeModel pins its transport (and thus its credentials)
+            # on first call, and the server-side content cache belongs to
+            # the old account: drop both so nothing built under the
+            # previous key serves requests for the new one
+            _get_model.cache_clear()
+            _cached_content = None
+            _cache_expires_at = 0.0
+            _cache_disabled_until = 0.0
+        _configured_key = api_key
         return True
     except Exception as e:
-        print(f"Error configuring Gemini: {e}")
+        logger.error(f"Error configuring Gemini: {e}")
         return False
 
+@dataclass(slots=True)
+class LeadProfile:
+    """
+    Structured per-lead profile fed into the outreach prompt. Slots keep
+    bulk runs from allocating a full dict-of-dicts per lead; the profile is
+    only converted back to a dict at the JSON serialization boundary.
+    """
+    company_name: str = None
+    business_type: str = "a local business"
+    location: str = "their city"
+    website: str = None
+    phone: str = None
+    emails: str = None
+    key_person: dict = field(default_factory=dict)
+    scraped_info: str = "Additional business information from website analysis."
+
+    def get(self, key, default=None):
+        """dict-style access for code that treats profiles as mappings."""
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return asdict(self)
+
 def create_lead_profile(lead_data):
     """Formats the raw lead data into a structured profile."""
-    profile = {
-        "company_name": lead_data.get("Business Name"),
-        "business_type": lead_data.get("Type", "a local business"),
-        "location": lead_data.get("Address", "their city"),
-        "website": lead_data.get("Website"),
-        "phone": lead_data.get("Phone"),
-        "emails": lead_data.get("Found Emails"),
-        "key_person": {
+    return LeadProfile(
+        company_name=lead_data.get("Business Name"),
+        business_type=lead_data.get("Type", "a local business"),
+        location=lead_data.get("Address", "their city"),
+        website=lead_data.get("Website"),
+        phone=lead_data.get("Phone"),
+        emails=lead_data.get("Found Emails"),
+        key_person={
             "name": lead_data.get("Person Name", ""),
             "title": lead_data.get("Person Title", "")
         },
         # Enhanced with more context from scraped data
-        "scraped_info": lead_data.get("scraped_info", "Additional business information from website analysis.")
-    }
-    return profile
-
-def generate_personalized_outreach_gemini(lead_profile):
-    """
-    Uses Google's Gemini 1.5 Pro to generate personalized messages.
-    This is the core of the autonomous agent's "thinking".
-    """
-    # Gemini 1.5 Pro has native JSON output mode, which is extremely reliable.
-    generation_config = {
-        "temperature": 0.7,  # Balanced for consistency with creativity
-        "response_mime_type": "application/json",
-    }
-    
-    model = genai.GenerativeModel(
-        model_name="gemini-1.5-pro-latest", # Or another suitable Gemini model
-        generation_config=generation_config
+        scraped_info=lead_data.get("scraped_info", "Additional business information from website analysis.")
     )
 
-    # Updated prompt with the 4 P's framework
-    prompt = f"""
+# The static persona/rules block (sections 1-4) never changes between leads,
+# so it is kept as one constant that can be hoisted into Gemini context
+# caching instead of being re-sent (and re-billed) on every call.
+PERSONA_AND_RULES = """
 ## 1. YOUR PERSONA
 You are "Alex", a sharp, friendly, and respectful Business Development Specialist at "GrowthBoost". Your expertise is in digital marketing and lead generation. Your tone is that of a helpful industry expert, not a pushy salesperson. You are confident, clear, and genuinely curious about the prospect's business. You NEVER use hyperbole or spammy language.
 
@@ -80,145 +121,524 @@ You must adhere to the following four principles for every piece of copy you wri
 - **Low-Friction Call-to-Action (CTA):** End with a simple, low-commitment question. This makes it easy to reply.
 - GOOD CTAs: "Curious if this is a priority for you right now?", "Would you be open to hearing one quick idea we had?", "Is this something you've been thinking about?"
 - BAD CTAs: "Can we book a 30-minute call?", "Are you free to meet next week?"
+"""
+
+# The output contract is enforced by the API itself via response_schema, so
+# the prompt no longer spends tokens describing the JSON shape (the old
+# "## 4. OUTPUT FORMAT" section).
+_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "email_subject": {"type": "string"},
+        "email_body": {"type": "string"},
+        "linkedin_dm": {"type": "string"},
+    },
+    "required": ["email_subject", "email_body", "linkedin_dm"],
+}
 
-## 4. OUTPUT FORMAT
-Your entire output MUST be a valid JSON object. Do not add any text before or after the JSON. The object must contain exactly three string keys: "email_subject", "email_body", and "linkedin_dm".
+# Gemini 1.5 Pro has native JSON output mode, which is extremely reliable.
+_GENERATION_CONFIG = {
+    "temperature": 0.7,  # Balanced for consistency with creativity
+    "response_mime_type": "application/json",
+    "response_schema": _RESPONSE_SCHEMA,
+}
 
-## 5. PROSPECT PROFILE TO ANALYZE
+@functools.lru_cache(maxsize=2)
+def _get_model(model_name="gemini-1.5-pro-latest"):
+    """
+    Returns the shared GenerativeModel for the full-prompt path. Memoized so
+    bulk runs don't reconstruct the model (name parsing, transport setup,
+    config validation) once per lead.
+    """
+    return genai.GenerativeModel(
+        model_name=model_name, # Or another suitable Gemini model
+        generation_config=_GENERATION_CONFIG
+    )
+
+# Transient failures worth retrying: quota blips and temporary unavailability.
+_RETRIABLE_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+)
+
+def _call_with_retry(model, prompt, request_options=None, max_attempts=5):
+    """
+    Calls the model with jittered exponential backoff on transient errors
+    (429 quota blips, 5xx unavailability). Combined with the shared model
+    instance, retries reuse the existing HTTP connection instead of paying
+    a fresh handshake, and a quota blip no longer degrades straight to the
+    generic fallback copy.
+    """
+    kwargs = {"request_options": request_options} if request_options else {}
+    for attempt in range(max_attempts):
+        try:
+            return model.generate_content(prompt, **kwargs)
+        except _RETRIABLE_ERRORS:
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(min(2 ** attempt + random.random(), 30))
+
+# How long the server-side cache of PERSONA_AND_RULES stays alive. The cache
+# is recreated a minute early so in-flight calls never hit an expired entry.
+_CACHE_TTL_SECONDS = 3600
+_cached_content = None
+_cache_expires_at = 0.0
+# After a caching failure (e.g. an account tier without context-caching
+# support) the full-prompt fallback is taken directly until this deadline,
+# instead of re-paying a failed CachedContent.create round-trip per lead.
+_cache_disabled_until = 0.0
+
+# Prompt pieces are assembled by concatenating constants around the profile
+# JSON so the static prefix is byte-identical across leads. Gemini's implicit
+# prefix caching only hits when the shared content sits unmodified at the
+# start of the prompt, so nothing lead-specific may appear before the JSON.
+_PROFILE_HEADER = """## 4. PROSPECT PROFILE TO ANALYZE
 ```json
-{json.dumps(lead_profile, indent=2)}
+"""
+
+STATIC_SUFFIX = """
 ```
 
 Generate the outreach copy now following the 4 P's framework:
+"""
+
+STATIC_PREFIX = PERSONA_AND_RULES + "\n" + _PROFILE_HEADER
+
+def _serialize_profile(lead_profile):
+    """
+    Serializes a profile deterministically so equal profiles produce
+    byte-identical prompts. Compact separators: the JSON is only read by the
+    model, and indentation whitespace is billed like any other input token.
+    """
+    if isinstance(lead_profile, LeadProfile):
+        lead_profile = lead_profile.to_dict()
+    return orjson.dumps(lead_profile, option=orjson.OPT_SORT_KEYS).decode()
+
+def _build_profile_section(lead_profile):
+    """Builds the per-lead (variable) part of the prompt."""
+    return _PROFILE_HEADER + _serialize_profile(lead_profile) + STATIC_SUFFIX
+
+def _build_prompt(lead_profile):
+    """Builds the full 4 P's outreach prompt for a single lead profile."""
+    return STATIC_PREFIX + _serialize_profile(lead_profile) + STATIC_SUFFIX
+
+# Fallback copy used when the API call fails. Kept as constants (with
+# per-lead data concatenated on, never interpolated into the middle) so the
+# strings stay byte-stable across leads.
+_FALLBACK_SUBJECT = "Quick thought on "
+_FALLBACK_EMAIL_INTRO = "Hi there! I came across "
+_FALLBACK_EMAIL_OUTRO = (
+    " and was impressed by what you're doing. Would love to share a quick "
+    "idea that might help with growth. Worth a brief chat?"
+)
+_FALLBACK_LINKEDIN_INTRO = "Hi! Noticed "
+_FALLBACK_LINKEDIN_MID = " - looks great! Quick question about "
+_FALLBACK_LINKEDIN_OUTRO = " - mind if I send a brief message?"
+
+def _get_cached_model(generation_config):
+    """
+    Returns a GenerativeModel backed by a server-side cache of the static
+    4 P's prompt, recreating the cache when its TTL lapses. Cached tokens are
+    billed at ~10% of the normal input rate and skip prompt processing, so
+    every lead only pays for its own profile JSON.
+
+    Returns None when context caching is unavailable (e.g. cache 404/expired
+    or the API tier doesn't support it) so callers can fall back to sending
+    the full prompt.
     """
-    
+    global _cached_content, _cache_expires_at, _cache_disabled_until
+    if time.time() < _cache_disabled_until:
+        return None
     try:
-        response = model.generate_content(prompt)
+        if _cached_content is None or time.time() >= _cache_expires_at:
+            _cached_content = genai.caching.CachedContent.create(
+                model="models/gemini-1.5-pro-latest",
+                system_instruction=PERSONA_AND_RULES,
+                ttl=f"{_CACHE_TTL_SECONDS}s",
+            )
+            _cache_expires_at = time.time() + _CACHE_TTL_SECONDS - 60
+        return genai.GenerativeModel.from_cached_content(
+            cached_content=_cached_content,
+            generation_config=generation_config,
+        )
+    except Exception as e:
+        logger.warning(f"Context caching unavailable, sending full prompt: {e}")
+        _cached_content = None
+        _cache_disabled_until = time.time() + _CACHE_TTL_SECONDS
+        return None
+
+def generate_personalized_outreach_gemini(lead_profile, use_cache=True,
+                                          request_options=None):
+    """
+    Uses Google's Gemini 1.5 Pro to generate personalized messages.
+    This is the core of the autonomous agent's "thinking".
+
+    Leads that match a previously generated (business type, state, title
+    bucket) template are served straight from the local cache — a string
+    substitution instead of an LLM round-trip.
+    """
+    if use_cache:
+        cached = _TEMPLATE_CACHE.get(lead_profile)
+        if cached is not None:
+            return cached
+
+    # Prefer a model bound to the cached persona/rules block: only the
+    # per-lead profile section is sent (and billed) per request.
+    model = _get_cached_model(_GENERATION_CONFIG)
+    if model is not None:
+        prompt = _build_profile_section(lead_profile)
+    else:
+        model = _get_model()
+        prompt = _build_prompt(lead_profile)
+
+    # Preassigned so the except block can safely inspect the response even
+    # when _call_with_retry itself raises (retries exhausted, non-retriable
+    # API error) and the assignment below never happens.
+    response = None
+    try:
+        response = _call_with_retry(model, prompt, request_options)
+
+        # Debug: confirm the server-side prefix cache actually hit
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            cached = getattr(usage, 'cached_content_token_count', 0)
+            logger.debug(f"Prompt tokens: {usage.prompt_token_count}, cached: {cached}")
+
         # The response text will be a clean JSON string thanks to response_mime_type
-        result = json.loads(response.text)
-        
+        try:
+            result = orjson.loads(response.text)
+        except ValueError:
+            # Truncated/near-valid JSON is common enough that a cheap local
+            # repair pass beats throwing the response away and re-paying for
+            # the whole call.
+            result = json_repair.loads(response.text)
+        if not isinstance(result, dict):
+            raise ValueError("Response was not a JSON object")
+
         # Validate the response has required fields
         required_fields = ['email_subject', 'email_body', 'linkedin_dm']
         if not all(field in result for field in required_fields):
-            print("Warning: Generated response missing required fields")
+            logger.warning("Generated response missing required fields")
+            # Synthesize a subject from the body's first line rather than
+            # discarding an otherwise usable response
+            if result.get('email_body') and not result.get('email_subject'):
+                first_line = str(result['email_body']).splitlines()[0]
+                result['email_subject'] = first_line[:60].rstrip('.!, ')
             
         # Add analytics fields for compatibility with UI
         result['personalization_angle'] = 'Generated using 4 P\'s framework'
         result['confidence_score'] = 8  # High confidence with structured framework
-            
+
+        if use_cache:
+            _TEMPLATE_CACHE.put(lead_profile, result)
+
         return result
     except Exception as e:
-        print(f"Error calling Gemini API: {e}")
+        logger.error(f"Error calling Gemini API: {e}")
         # Enhanced error handling with fallback
         error_response_text = getattr(response, 'text', 'No response text available.')
-        print(f"Gemini raw response: {error_response_text}")
+        logger.error(f"Gemini raw response: {error_response_text}")
         
-        # Provide basic fallback message
+        # Provide basic fallback message built from the constant pieces
+        company = lead_profile.get('company_name') or 'your business'
+        business_type = lead_profile.get('business_type') or 'your industry'
         fallback = {
-            'email_subject': f"Quick thought on {lead_profile.get('company_name', 'your business')}",
-            'email_body': f"Hi there! I came across {lead_profile.get('company_name', 'your business')} and was impressed by what you're doing. Would love to share a quick idea that might help with growth. Worth a brief chat?",
-            'linkedin_dm': f"Hi! Noticed {lead_profile.get('company_name', 'your business')} - looks great! Quick question about {lead_profile.get('business_type', 'your industry')} - mind if I send a brief message?",
+            'email_subject': _FALLBACK_SUBJECT + company,
+            'email_body': _FALLBACK_EMAIL_INTRO + company + _FALLBACK_EMAIL_OUTRO,
+            'linkedin_dm': (_FALLBACK_LINKEDIN_INTRO + company + _FALLBACK_LINKEDIN_MID
+                            + business_type + _FALLBACK_LINKEDIN_OUTRO),
             'personalization_angle': 'Generic fallback due to API error',
             'confidence_score': 3
         }
         return fallback
 
-def generate_bulk_outreach(leads_df, gemini_api_key):
+# Defaults applied column-wise before bulk loops, so per-row profile
+# construction never runs fallback logic (and NaN cells from pandas don't
+# leak into prompts, which the per-row .get defaults never caught).
+_PROFILE_DEFAULTS = {
+    'Type': 'a local business',
+    'Address': 'their city',
+    'Person Name': '',
+    'Person Title': '',
+    'scraped_info': 'Additional business information from website analysis.',
+}
+
+def _normalize_leads(leads_df):
+    """Fills profile defaults in one vectorized pass over the frame."""
+    df = leads_df.copy()
+    present = {col: default for col, default in _PROFILE_DEFAULTS.items()
+               if col in df.columns}
+    if present:
+        df = df.fillna(present)
+    for col, default in _PROFILE_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default
+    return df
+
+def _result_row(idx, lead, messages):
+    """Builds one results-DataFrame row from a lead and its generated messages."""
+    return {
+        'lead_id': lead.get('id', idx),
+        'business_name': lead.get('Business Name', 'Unknown'),
+        'email_subject': messages.get('email_subject', ''),
+        'email_body': messages.get('email_body', ''),
+        'linkedin_dm': messages.get('linkedin_dm', ''),
+        'personalization_angle': messages.get('personalization_angle', 'Unknown'),
+        'confidence_score': messages.get('confidence_score', 5),
+        'generated_at': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def _finalize_results(results, total_leads):
+    """
+    Builds the results DataFrame and attaches run analytics. The analytics
+    are computed as vectorized column reductions over the finished frame
+    (mean/sum/value_counts) rather than per-row counters in the loop.
+    """
+    results_df = pd.DataFrame(results)
+
+    successful = len(results_df)
+    if successful:
+        # Word counts as two C-level column ops instead of Python splits per
+        # row; int32 is plenty for message lengths and halves the footprint.
+        results_df['word_count_email'] = (
+            results_df['email_body'].str.split().str.len().fillna(0).astype('int32')
+        )
+        results_df['word_count_linkedin'] = (
+            results_df['linkedin_dm'].str.split().str.len().fillna(0).astype('int32')
+        )
+    analytics = {
+        'total_leads': total_leads,
+        'successful_generations': successful,
+        'failed_generations': total_leads - successful,
+        'avg_confidence_score': round(float(results_df['confidence_score'].mean()), 2) if successful else 0,
+        'personalization_angles': results_df['personalization_angle'].value_counts().to_dict() if successful else {},
+        'high_confidence_count': int((results_df['confidence_score'] >= 8).sum()) if successful else 0,
+        'success_rate': round((successful / total_leads) * 100, 1) if total_leads else 0,
+    }
+
+    if not results_df.empty:
+        results_df.attrs['analytics'] = analytics
+    return results_df
+
+async def _generate_one_async(model, lead_profile, sem, max_attempts=4):
+    """
+    Generates one lead's messages under the concurrency semaphore,
+    retrying transient quota/availability errors with jittered backoff.
+    """
+    async with sem:
+        for attempt in range(max_attempts):
+            try:
+                response = await model.generate_content_async(_build_prompt(lead_profile))
+                result = orjson.loads(response.text)
+                result['personalization_angle'] = 'Generated using 4 P\'s framework'
+                result['confidence_score'] = 8
+                return result
+            except _RETRIABLE_ERRORS:
+                if attempt == max_attempts - 1:
+                    raise
+                await asyncio.sleep(min(2 ** attempt + random.random(), 30))
+
+async def generate_bulk_outreach_async(leads_df, gemini_api_key, concurrency=8):
+    """
+    Async variant of generate_bulk_outreach for interactive runs where batch
+    mode is too slow to start. All per-lead calls launch concurrently behind
+    an asyncio.Semaphore sized to the account's rate limit, so wall time is
+    roughly one round-trip plus queueing instead of N round-trips.
+    """
+    if not configure_gemini(gemini_api_key):
+        return None
+
+    model = _get_model()
+    sem = asyncio.Semaphore(concurrency)
+
+    leads_df = _normalize_leads(leads_df)
+    records = leads_df.to_dict('records')
+    profiles = [create_lead_profile(rec) for rec in records]
+    responses = await asyncio.gather(
+        *[_generate_one_async(model, profile, sem) for profile in profiles],
+        return_exceptions=True
+    )
+
+    results = []
+    for idx, rec, messages in zip(leads_df.index, records, responses):
+        if isinstance(messages, Exception) or not messages:
+            logger.error(f"Error generating outreach for {rec.get('Business Name', 'Unknown')}: {messages}")
+            continue
+        results.append(_result_row(idx, rec, messages))
+
+    return _finalize_results(results, len(leads_df))
+
+def generate_bulk_outreach_parallel(leads_df, gemini_api_key, concurrency=8):
+    """Sync wrapper around generate_bulk_outreach_async for non-async callers."""
+    return asyncio.run(generate_bulk_outreach_async(leads_df, gemini_api_key, concurrency))
+
+def _generate_batch_messages(leads_df, gemini_api_key, poll_interval=30):
+    """
+    Submits every lead prompt as a single Gemini Batch API job instead of
+    one synchronous call per lead. The job runs asynchronously server-side,
+    so a 100-lead run costs one submit + poll loop instead of 100 round-trips
+    (and batch pricing is 50% of the interactive rate).
+
+    Returns a dict mapping "lead_{idx}" -> parsed message dict.
+    """
+    # The Batch API lives in the newer google-genai client library.
+    from google import genai as genai_client
+
+    client = genai_client.Client(api_key=gemini_api_key)
+
+    # 1. Write one JSONL line per lead, keyed so results can be matched back
+    batch_file = "batch_requests.jsonl"
+    columns = list(leads_df.columns)
+    with open(batch_file, "w") as f:
+        for row in leads_df.itertuples(index=True, name=None):
+            idx = row[0]
+            profile = create_lead_profile(dict(zip(columns, row[1:])))
+            request_line = {
+                "key": f"lead_{idx}",
+                "request": {
+                    "contents": [{"parts": [{"text": _build_prompt(profile)}]}],
+                    "generation_config": {
+                        "temperature": 0.7,
+                        "response_mime_type": "application/json",
+                        "response_schema": _RESPONSE_SCHEMA,
+                    },
+                },
+            }
+            f.write(orjson.dumps(request_line).decode() + "\n")
+
+    # 2. Upload the request file and create the batch job
+    uploaded = client.files.upload(
+        file=batch_file,
+        config={"display_name": "leadgenius-outreach-batch", "mime_type": "jsonl"},
+    )
+    batch_job = client.batches.create(
+        model="gemini-1.5-pro-latest",
+        src=uploaded.name,
+    )
+
+    # 3. Poll until the job reaches a terminal state
+    terminal_states = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED"}
+    while batch_job.state.name not in terminal_states:
+        time.sleep(poll_interval)
+        batch_job = client.batches.get(name=batch_job.name)
+
+    if batch_job.state.name != "JOB_STATE_SUCCEEDED":
+        raise Exception(f"Batch job finished in state: {batch_job.state.name}")
+
+    # 4. Download the result file and parse each JSONL line back by key
+    result_bytes = client.files.download(file=batch_job.dest.file_name)
+    messages = {}
+    for line in result_bytes.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = orjson.loads(line)
+        key = entry.get("key")
+        try:
+            text = entry["response"]["candidates"][0]["content"]["parts"][0]["text"]
+            result = orjson.loads(text)
+        except (KeyError, IndexError, ValueError) as e:
+            logger.warning(f"Could not parse batch result for {key}: {e}")
+            continue
+        # Same analytics fields the sync path attaches
+        result['personalization_angle'] = 'Generated using 4 P\'s framework'
+        result['confidence_score'] = 8
+        messages[key] = result
+
+    return messages
+
+def generate_bulk_outreach(leads_df, gemini_api_key, mode="sync",
+                           service_tier="standard"):
     """
     Generate personalized outreach for multiple leads at once.
     Enhanced with analytics and quality metrics.
+
+    mode="batch" routes the whole run through the Gemini Batch API
+    (cheaper, higher latency); mode="sync" keeps the per-lead calls.
+    service_tier is accepted for forward compatibility but currently a
+    no-op: the google-generativeai SDK's request_options only forwards
+    retry/timeout/metadata, so there is no supported way to mark sync
+    requests as sheddable yet. Sheddable bulk pricing is available today
+    via mode="batch".
     """
     if not configure_gemini(gemini_api_key):
         return None
-    
+
+    leads_df = _normalize_leads(leads_df)
+    if service_tier != "standard":
+        logger.info(f"service_tier={service_tier!r} is not supported by the SDK yet; "
+                    "sending standard sync requests (use mode='batch' for discounted bulk runs)")
+
+    batch_messages = None
+    if mode == "batch":
+        try:
+            batch_messages = _generate_batch_messages(leads_df, gemini_api_key)
+        except Exception as e:
+            logger.error(f"Batch generation failed, falling back to sync: {e}")
+
+
     results = []
-    analytics = {
-        'total_leads': len(leads_df),
-        'successful_generations': 0,
-        'failed_generations': 0,
-        'avg_confidence_score': 0,
-        'personalization_angles': {},
-        'high_confidence_count': 0  # confidence >= 8
-    }
-    
-    for idx, lead in leads_df.iterrows():
+
+    # itertuples avoids boxing every row into a Series the way iterrows does;
+    # plain tuples are zipped back to the original column names since they
+    # contain spaces that itertuples would otherwise mangle.
+    # Duplicate rows (same profile content, e.g. a CSV imported twice) reuse
+    # the first generation instead of paying another API round-trip.
+    seen = {}
+    columns = list(leads_df.columns)
+    for row in leads_df.itertuples(index=True, name=None):
+        idx = row[0]
+        lead = dict(zip(columns, row[1:]))
         try:
             # Create profile for each lead
-            profile = create_lead_profile(lead.to_dict())
-            
-            # Generate personalized messages
-            messages = generate_personalized_outreach_gemini(profile)
-            
-            if messages:
-                # Extract confidence score and personalization angle
-                confidence_score = messages.get('confidence_score', 5)
-                personalization_angle = messages.get('personalization_angle', 'Unknown')
-                
-                result = {
-                    'lead_id': lead.get('id', idx),
-                    'business_name': lead.get('Business Name', 'Unknown'),
-                    'email_subject': messages.get('email_subject', ''),
-                    'email_body': messages.get('email_body', ''),
-                    'linkedin_dm': messages.get('linkedin_dm', ''),
-                    'personalization_angle': personalization_angle,
-                    'confidence_score': confidence_score,
-                    'generated_at': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'word_count_email': len(messages.get('email_body', '').split()),
-                    'word_count_linkedin': len(messages.get('linkedin_dm', '').split())
-                }
-                results.append(result)
-                
-                # Update analytics
-                analytics['successful_generations'] += 1
-                analytics['avg_confidence_score'] += confidence_score
-                
-                if confidence_score >= 8:
-                    analytics['high_confidence_count'] += 1
-                
-                # Track personalization angles
-                if personalization_angle in analytics['personalization_angles']:
-                    analytics['personalization_angles'][personalization_angle] += 1
-                else:
-                    analytics['personalization_angles'][personalization_angle] = 1
+            profile = create_lead_profile(lead)
+            profile_hash = hashlib.blake2b(
+                _serialize_profile(profile).encode()).hexdigest()
+
+            # Generate personalized messages (from the batch job if one ran)
+            if profile_hash in seen:
+                messages = seen[profile_hash]
+            elif batch_messages is not None:
+                messages = batch_messages.get(f"lead_{idx}")
             else:
-                analytics['failed_generations'] += 1
-            
+                messages = generate_personalized_outreach_gemini(profile)
+
+            if messages:
+                seen[profile_hash] = messages
+                results.append(_result_row(idx, lead, messages))
+
         except Exception as e:
-            print(f"Error generating outreach for {lead.get('Business Name', 'Unknown')}: {e}")
-            analytics['failed_generations'] += 1
+            logger.error(f"Error generating outreach for {lead.get('Business Name', 'Unknown')}: {e}")
             continue
-    
-    # Calculate final analytics
-    if analytics['successful_generations'] > 0:
-        analytics['avg_confidence_score'] = round(
-            analytics['avg_confidence_score'] / analytics['successful_generations'], 2
-        )
-        analytics['success_rate'] = round(
-            (analytics['successful_generations'] / analytics['total_leads']) * 100, 1
-        )
-    else:
-        analytics['avg_confidence_score'] = 0
-        analytics['success_rate'] = 0
-    
-    results_df = pd.DataFrame(results)
-    
-    # Add analytics as metadata to the DataFrame
-    if not results_df.empty:
-        results_df.attrs['analytics'] = analytics
-    
-    return results_df
 
-def save_outreach_messages(messages_df, filename=None):
-    """Save generated outreach messages to JSON file."""
+    return _finalize_results(results, len(leads_df))
+
+def save_outreach_messages(messages_df, filename=None, format="jsonl"):
+    """
+    Save generated outreach messages to disk.
+
+    format="jsonl" (default) streams one orjson-encoded record per line, so
+    the write stays constant-memory instead of materializing the whole JSON
+    document the way DataFrame.to_json does. format="json" keeps the old
+    pretty-printed single-document output for backward compatibility.
+    """
     if filename is None:
         timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"outreach_messages_{timestamp}.json"
-    
+        suffix = "jsonl" if format == "jsonl" else "json"
+        filename = f"outreach_messages_{timestamp}.{suffix}"
+
     try:
-        messages_df.to_json(filename, orient='records', indent=2)
+        if format == "jsonl":
+            with open(filename, 'wb') as f:
+                for record in messages_df.to_dict(orient='records'):
+                    f.write(orjson.dumps(record))
+                    f.write(b'\n')
+        else:
+            messages_df.to_json(filename, orient='records', indent=2)
         return filename
     except Exception as e:
-        print(f"Error saving outreach messages: {e}")
+        logger.error(f"Error saving outreach messages: {e}")
         return None
 
 # --- Example Usage ---
@@ -295,8 +715,11 @@ if __name__ == "__main__":
                     }
                 ]
                 
-                leads_df = pd.DataFrame(sample_leads_data)
-                bulk_results = generate_bulk_outreach(leads_df, GEMINI_API_KEY)
+                # The first sample already has its messages from the single
+                # call above, so only the remaining leads go to the bulk run.
+                leads_df = pd.DataFrame(sample_leads_data[1:])
+                bulk_results = generate_bulk_outreach(leads_df, GEMINI_API_KEY,
+                                                      service_tier="flex")
                 
                 if bulk_results is not None and not bulk_results.empty:
                     analytics = getattr(bulk_results, 'attrs', {}).get('analytics', {})
@@ -1,13 +1,21 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from lead_generator import generate_leads
-from ai_outreach import generate_personalized_outreach_gemini, create_lead_profile, configure_gemini, generate_bulk_outreach, save_outreach_messages
-from email_sender import EmailSender, format_email_content
+import functools
+import gzip
+import io
 import os
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import time
 import uuid
-import pyperclip
+import atexit
+
+# The AI-outreach and email backends are imported lazily inside the tabs
+# that use them: Streamlit re-executes this script on every interaction,
+# and those modules pull in heavy SDKs that most reruns never touch.
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -17,39 +25,350 @@ st.set_page_config(
 )
 
 # --- Helper functions ---
-@st.cache_data
+# Cached helpers are keyed on a session-level version counter bumped on every
+# leads mutation, so cache lookups are an O(1) integer compare instead of
+# Streamlit hashing the whole DataFrame on each rerun.
+def _session_token():
+    """Random per-session token mixed into the versioned cache keys.
+
+    st.cache_data is shared across sessions while the version counters are
+    per-session and all start at 0; without the token, two sessions at the
+    same counter value would read each other's cached derivations.
+    """
+    if '_cache_token' not in st.session_state:
+        st.session_state._cache_token = uuid.uuid4().hex
+    return st.session_state._cache_token
+
+_DF_VERSION_HASH = {pd.DataFrame: lambda _: f"{_session_token()}:{st.session_state.get('_df_version', 0)}"}
+
+def bump_df_version():
+    """Invalidate the DataFrame-derived caches after a leads mutation"""
+    st.session_state._df_version = st.session_state.get('_df_version', 0) + 1
+
+@st.cache_data(hash_funcs=_DF_VERSION_HASH)
 def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
+    # Encode in chunks straight into a bytes buffer so peak memory is the
+    # final payload, not payload plus a full intermediate str
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, chunksize=10000, encoding='utf-8')
+    return buf.getvalue()
+
+@st.cache_data(hash_funcs=_DF_VERSION_HASH)
+def get_status_list(df):
+    """Distinct status values, recomputed only when the leads change"""
+    return list(df['status'].unique()) if 'status' in df.columns else []
+
+@st.cache_data(hash_funcs=_DF_VERSION_HASH)
+def get_status_counts(df):
+    """Status value counts, recomputed only when the leads change"""
+    return df['status'].value_counts() if 'status' in df.columns else pd.Series(dtype=int)
+
+# Same versioned-key scheme for the outreach messages DataFrame
+_OUTREACH_VERSION_HASH = {pd.DataFrame: lambda _: f"{_session_token()}:{st.session_state.get('_outreach_version', 0)}"}
+
+def bump_outreach_version():
+    """Invalidate outreach-derived caches after a message mutation"""
+    st.session_state._outreach_version = st.session_state.get('_outreach_version', 0) + 1
+
+@st.cache_data(hash_funcs=_OUTREACH_VERSION_HASH)
+def compute_outreach_metrics(df):
+    """Aggregate message-quality metrics, recomputed only on mutation"""
+    high_quality = df['confidence_score'] >= 8
+    return {
+        'avg_conf': df['confidence_score'].mean(),
+        'high_quality': int(high_quality.sum()),
+        'avg_email_words': df['word_count_email'].mean() if 'word_count_email' in df.columns else 0,
+        'unique_strategies': df['personalization_angle'].nunique() if 'personalization_angle' in df.columns else 0,
+    }
+
+@st.cache_data(hash_funcs=_OUTREACH_VERSION_HASH)
+def export_outreach_csv(df):
+    buf = io.BytesIO()
+    # Internal helper columns (underscore-prefixed) stay out of the export
+    export_cols = [c for c in df.columns if not c.startswith('_')]
+    df[export_cols].to_csv(buf, index=False, chunksize=10000, encoding='utf-8')
+    return buf.getvalue()
+
+@st.cache_resource
+def get_email_sender(api_key):
+    """Construct the SendGrid client once per API key, not per rerun"""
+    from email_sender import EmailSender
+    return EmailSender(api_key)
+
+@st.cache_resource
+def get_send_executor():
+    """Shared thread pool for email dispatch, kept alive across reruns"""
+    return ThreadPoolExecutor(max_workers=20)
+
+def _bn_key(name):
+    """Normalized business-name key for matching drafts back to leads.
+
+    Case and surrounding whitespace routinely differ between the leads
+    table and the generated messages; an exact string compare would
+    silently drop the match.
+    """
+    return str(name).strip().lower()
+
+def batch_uuids(n):
+    """Generate n random UUID strings from a single urandom read"""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(n)]
+
+@st.cache_data(hash_funcs=_DF_VERSION_HASH)
+def get_lead_options(df):
+    """'Business Name - status' labels for the outreach multiselect"""
+    if 'status' in df.columns:
+        status_col = df['status'].fillna('New').astype(str)
+    else:
+        status_col = 'New'
+    return (df['Business Name'].astype(str) + ' - ' + status_col).tolist()
+
+@st.cache_data(hash_funcs=_DF_VERSION_HASH)
+def build_search_blob(df):
+    """One lowercased Series with every column's text, for substring search"""
+    # Cast to string dtype before filling: fillna('') on the categorical
+    # status column raises for the NaNs its astype produces on legacy
+    # values, and NaT from the created_at coercion must become text
+    # before the row join
+    return (df.apply(lambda c: c.astype('string')).fillna('')
+              .agg(' '.join, axis=1).str.lower())
+
+# Lead statuses form a small fixed vocabulary, so the column is stored as a
+# categorical: int8 codes instead of Python string objects, which also makes
+# equality filters and value_counts operate on codes
+STATUS_CATEGORIES = pd.CategoricalDtype(['New', 'Contacted', 'Qualified', 'Converted', 'Rejected'])
+STATUS_OPTIONS = list(STATUS_CATEGORIES.categories)
+
+# Columns shown in the table views, selected by position (iloc) to skip the
+# label-to-position hash lookups of fancy indexing on every rerun
+PREVIEW_COLS = ['Business Name', 'Address', 'Phone', 'Website', 'Found Emails']
+
+def _preview_view(df, cols):
+    """Positionally select the display columns that exist in df"""
+    positions = [df.columns.get_loc(c) for c in cols if c in df.columns]
+    return df.iloc[:, positions]
+
+def ensure_status_dtype(df):
+    """Re-apply the categorical status dtype after loads and concats"""
+    if 'status' in df.columns and df['status'].dtype != STATUS_CATEGORIES:
+        df['status'] = df['status'].astype(STATUS_CATEGORIES)
+    if 'created_at' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['created_at']):
+        # Real datetime64 column: date comparisons and sorts run on int64
+        # instead of strings
+        df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+    if 'Found Emails' in df.columns:
+        # First address split out and validated once per load/merge, so the
+        # send paths read a precomputed column instead of re-parsing the
+        # comma-separated string per click
+        primary = df['Found Emails'].astype('string').str.split(',', n=1).str[0].str.strip()
+        df['primary_email'] = primary
+        df['primary_email_valid'] = primary.str.contains(r'^[^@]+@[^@]+\.[^@]+$', na=False).astype('bool')
+    return df
+
+# Persistence is an append-only event log plus a periodic snapshot: every
+# CRUD op appends one JSONL line (O(changed rows) I/O) instead of rewriting
+# the whole database file, and the log is folded back into the snapshot once
+# it grows past the compaction threshold.
+LEADS_SNAPSHOT_FILE = 'leads_database.json.gz'
+LEADS_SNAPSHOT_FILE_LEGACY = 'leads_database.json'
+LEADS_LOG_FILE = 'leads_log.jsonl'
+LOG_COMPACT_THRESHOLD = 2000
+
+def _apply_lead_event(records, event):
+    """Replays one logged CRUD event onto the in-memory record list."""
+    event_type = event.get('event')
+    data = event.get('data', {})
+    if event_type == 'add':
+        records.append(data)
+    elif event_type == 'clear':
+        records.clear()
+    elif event_type in ('update', 'status_change'):
+        lead_id = data.get('id')
+        for record in records:
+            if record.get('id') == lead_id:
+                record.update(data)
+                break
+    elif event_type == 'delete':
+        lead_id = data.get('id')
+        records[:] = [r for r in records if r.get('id') != lead_id]
+
+@functools.lru_cache(maxsize=1)
+def _load_snapshot(path, mtime):
+    """Parse the snapshot once per (path, mtime); new sessions share it"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def load_leads_from_file():
-    """Load leads from JSON file if it exists"""
+    """Load leads from the snapshot, then replay any logged events"""
+    records = []
+    try:
+        for path in (LEADS_SNAPSHOT_FILE, LEADS_SNAPSHOT_FILE_LEGACY):
+            if os.path.exists(path):
+                # Shallow-copy the rows so log replay can't mutate the
+                # process-level cached parse
+                records = [dict(r) for r in _load_snapshot(path, os.path.getmtime(path))]
+                break
+    except:
+        records = []
     try:
-        if os.path.exists('leads_database.json'):
-            with open('leads_database.json', 'r') as f:
-                data = json.load(f)
-                return pd.DataFrame(data)
+        if os.path.exists(LEADS_LOG_FILE):
+            with open(LEADS_LOG_FILE, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        _apply_lead_event(records, orjson.loads(line))
     except:
         pass
-    return pd.DataFrame()
+    return ensure_status_dtype(pd.DataFrame(records))
+
+def _write_snapshot(df):
+    """Write a compact gzipped snapshot and truncate the event log"""
+    # No indentation (halves the JSON bytes) and compresslevel=1, which is
+    # nearly as small as the default for JSON at several times the speed
+    with gzip.open(LEADS_SNAPSHOT_FILE, 'wb', compresslevel=1) as f:
+        f.write(orjson.dumps(df.to_dict('records'), default=str))
+    open(LEADS_LOG_FILE, 'w').close()
+
+def compact_leads_log():
+    """Fold the event log into a fresh snapshot and truncate the log"""
+    try:
+        _write_snapshot(st.session_state.get('leads_df', pd.DataFrame()))
+        return True
+    except:
+        return False
+
+def _log_length():
+    try:
+        with open(LEADS_LOG_FILE, 'r') as f:
+            return sum(1 for _ in f)
+    except:
+        return 0
+
+def append_lead_events(event_type, records):
+    """Append one JSONL event per changed row; compact when the log is long"""
+    try:
+        with open(LEADS_LOG_FILE, 'ab') as f:
+            for record in records:
+                f.write(orjson.dumps({'event': event_type, 'data': record}, default=str) + b'\n')
+    except:
+        return False
+    if _log_length() > LOG_COMPACT_THRESHOLD:
+        compact_leads_log()
+    return True
+
+def append_lead_event(event_type, record):
+    """Append a single CRUD event to the log"""
+    return append_lead_events(event_type, [record])
 
 def save_leads_to_file(df):
-    """Save leads to JSON file"""
+    """Full save: write a fresh snapshot (also truncates the event log)"""
     try:
-        df.to_json('leads_database.json', orient='records', indent=2)
+        _write_snapshot(df)
         return True
     except:
         return False
 
+def mark_leads_dirty():
+    """Record an in-memory leads change to be persisted later.
+
+    The high-frequency HITL actions (send, reject) used to rewrite the
+    whole snapshot per click; they now just flip this flag and the
+    changes reach disk via the periodic flush, the Save Now button or
+    the atexit hook.
+    """
+    st.session_state._leads_dirty = True
+
+def flush_leads_if_dirty():
+    """Write the snapshot if there are deferred changes"""
+    if st.session_state.get('_leads_dirty'):
+        save_leads_to_file(st.session_state.leads_df)
+        st.session_state._leads_dirty = False
+        st.session_state._last_leads_flush = time.monotonic()
+
+def maybe_flush_leads(interval_seconds=30):
+    """Flush deferred changes at most once per interval"""
+    if not st.session_state.get('_leads_dirty'):
+        return
+    if time.monotonic() - st.session_state.get('_last_leads_flush', 0.0) >= interval_seconds:
+        flush_leads_if_dirty()
+
+def _flush_leads_at_exit():
+    # Session state may already be gone at interpreter shutdown
+    try:
+        flush_leads_if_dirty()
+    except Exception:
+        pass
+
+def _build_lead_key_set(df):
+    """Composite (Business Name, Address) keys for O(1) duplicate checks"""
+    if df.empty or 'Business Name' not in df.columns or 'Address' not in df.columns:
+        return set()
+    return set(zip(df['Business Name'], df['Address']))
+
+def flush_pending_leads():
+    """Materialize buffered single-lead inserts with one concat"""
+    buffer = st.session_state.get('pending_leads_buffer')
+    if buffer:
+        new_df = pd.DataFrame(buffer)
+        if st.session_state.leads_df.empty:
+            st.session_state.leads_df = new_df
+        else:
+            st.session_state.leads_df = pd.concat([st.session_state.leads_df, new_df], ignore_index=True)
+        st.session_state.leads_df = ensure_status_dtype(st.session_state.leads_df)
+        buffer.clear()
+        bump_df_version()
+
+def flush_outreach_chunks():
+    """Fold buffered generation batches into the messages DataFrame"""
+    chunks = st.session_state.get('_outreach_chunks')
+    if chunks:
+        frames = [] if st.session_state.outreach_messages.empty else [st.session_state.outreach_messages]
+        st.session_state.outreach_messages = pd.concat(frames + chunks, ignore_index=True)
+        if 'business_name' in st.session_state.outreach_messages.columns:
+            # Casefold the search haystack once per mutation instead of on
+            # every keystroke in the search boxes
+            st.session_state.outreach_messages['_business_name_lower'] = st.session_state.outreach_messages['business_name'].str.lower()
+        # Newly appended drafts start unsent; doing this here keeps the
+        # HITL tab free of column-initialization work per rerun. The
+        # explicit bool dtype keeps the column a packed numpy array (the
+        # NaNs from concat would otherwise upcast it to object and push
+        # every comparison through per-element Python dispatch).
+        if 'email_sent' in st.session_state.outreach_messages.columns:
+            st.session_state.outreach_messages['email_sent'] = st.session_state.outreach_messages['email_sent'].fillna(False).astype('bool')
+        else:
+            st.session_state.outreach_messages['email_sent'] = pd.Series(
+                False, index=st.session_state.outreach_messages.index, dtype='bool')
+        chunks.clear()
+        bump_outreach_version()
+
 def initialize_session_state():
     """Initialize session state variables"""
     if 'leads_df' not in st.session_state:
         st.session_state.leads_df = load_leads_from_file()
+    if 'outreach_messages' not in st.session_state:
+        st.session_state.outreach_messages = pd.DataFrame()
+    if '_outreach_chunks' not in st.session_state:
+        st.session_state._outreach_chunks = []
+    if 'pending_leads_buffer' not in st.session_state:
+        st.session_state.pending_leads_buffer = []
+    if '_df_version' not in st.session_state:
+        st.session_state._df_version = 0
+    if '_lead_key_set' not in st.session_state:
+        st.session_state._lead_key_set = _build_lead_key_set(st.session_state.leads_df)
     if 'edit_mode' not in st.session_state:
         st.session_state.edit_mode = False
     if 'edit_index' not in st.session_state:
         st.session_state.edit_index = None
     if 'show_add_form' not in st.session_state:
         st.session_state.show_add_form = False
+    if '_leads_dirty' not in st.session_state:
+        st.session_state._leads_dirty = False
+    if 'compact_registered' not in st.session_state:
+        # Make sure deferred saves and logged-but-uncompacted events get
+        # folded into the snapshot when the server shuts down
+        atexit.register(_flush_leads_at_exit)
+        atexit.register(compact_leads_log)
+        st.session_state.compact_registered = True
 
 # Initialize session state
 initialize_session_state()
@@ -72,19 +391,27 @@ with st.sidebar:
     with col2:
         if st.button("🔄 Refresh", use_container_width=True):
             st.session_state.leads_df = load_leads_from_file()
+            st.session_state._lead_key_set = _build_lead_key_set(st.session_state.leads_df)
+            bump_df_version()
             st.rerun()
     
+    if st.session_state.get('_leads_dirty'):
+        if st.button("💾 Save Now", use_container_width=True):
+            flush_leads_if_dirty()
+            st.success("Leads saved!")
+
     # Lead Statistics
+    flush_pending_leads()
+    maybe_flush_leads()
     if not st.session_state.leads_df.empty:
         st.subheader("📊 Lead Statistics")
         total_leads = len(st.session_state.leads_df)
         st.metric("Total Leads", total_leads)
         
         # Show status distribution if exists
-        if 'status' in st.session_state.leads_df.columns:
-            status_counts = st.session_state.leads_df['status'].value_counts()
-            for status, count in status_counts.items():
-                st.metric(f"{status} Leads", count)
+        status_counts = get_status_counts(st.session_state.leads_df)
+        for status, count in status_counts.items():
+            st.metric(f"{status} Leads", count)
     
     st.divider()
     
@@ -132,17 +459,27 @@ with tab1:
                 leads_generator = generate_leads(api_key, query, max_results)
                 
                 all_leads = []
-                for i, (status, current_leads) in enumerate(leads_generator):
-                    all_leads = current_leads
+                for i, (status, new_lead) in enumerate(leads_generator):
+                    all_leads.append(new_lead)
                     status_text.text(status)
-                    progress_bar.progress((i + 1) / max_results)
+                    progress_bar.progress(min((i + 1) / max_results, 1.0))
                 
+                # Drop leads already in the database: O(1) set probe per
+                # candidate instead of a DataFrame scan
+                key_set = st.session_state._lead_key_set
+                new_leads = [r for r in all_leads if (r.get('Business Name'), r.get('Address')) not in key_set]
+                key_set.update((r.get('Business Name'), r.get('Address')) for r in new_leads)
+                duplicates = len(all_leads) - len(new_leads)
+                if duplicates:
+                    st.info(f"⏭️ Skipped {duplicates} leads already in the database")
+
                 # Add generated leads to existing database
-                new_leads_df = pd.DataFrame(all_leads)
+                new_leads_df = pd.DataFrame(new_leads)
                 if not new_leads_df.empty:
                     # Add unique IDs and timestamps
-                    new_leads_df['id'] = [str(uuid.uuid4()) for _ in range(len(new_leads_df))]
-                    new_leads_df['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    generated_at = pd.Timestamp.now()
+                    new_leads_df['id'] = batch_uuids(len(new_leads_df))
+                    new_leads_df['created_at'] = generated_at
                     new_leads_df['status'] = 'New'
                     
                     # Merge with existing leads
@@ -150,90 +487,127 @@ with tab1:
                         st.session_state.leads_df = new_leads_df
                     else:
                         st.session_state.leads_df = pd.concat([st.session_state.leads_df, new_leads_df], ignore_index=True)
-                    
-                    # Save to file
-                    save_leads_to_file(st.session_state.leads_df)
+                    st.session_state.leads_df = ensure_status_dtype(st.session_state.leads_df)
+                    bump_df_version()
+
+                    # Log the new rows instead of rewriting the whole database
+                    append_lead_events('add', new_leads_df.to_dict('records'))
                     status_text.success(f"✅ Generated {len(new_leads_df)} new leads!")
                     
                     # Show preview
                     st.subheader("🎯 New Leads Generated")
-                    st.dataframe(new_leads_df[['Business Name', 'Address', 'Phone', 'Website', 'Found Emails']], use_container_width=True)
+                    st.dataframe(_preview_view(new_leads_df, PREVIEW_COLS), use_container_width=True)
 
             except Exception as e:
                 st.error(f"❌ An error occurred: {e}")
 
 with tab2:
     st.subheader("📋 Lead Database Management")
-    
+    flush_pending_leads()
+
     if st.session_state.leads_df.empty:
         st.info("No leads in database. Generate some leads first!")
     else:
-        # Search and filter
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            search_term = st.text_input("🔍 Search leads", placeholder="Search by business name, phone, email...")
-        with col2:
-            status_filter = st.selectbox("Filter by Status", ["All"] + list(st.session_state.leads_df['status'].unique()) if 'status' in st.session_state.leads_df.columns else ["All"])
-        with col3:
-            sort_by = st.selectbox("Sort by", ["Business Name", "created_at", "status"] if 'created_at' in st.session_state.leads_df.columns else ["Business Name"])
-        
-        # Apply filters
-        filtered_df = st.session_state.leads_df.copy()
+        # Search and filter. The form debounces typing: the filter pipeline
+        # runs once per submitted query instead of on every keystroke.
+        with st.form("lead_search_form"):
+            col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+            with col1:
+                search_term = st.text_input("🔍 Search leads", placeholder="Search by business name, phone, email...")
+            with col2:
+                status_filter = st.selectbox("Filter by Status", ["All"] + get_status_list(st.session_state.leads_df))
+            with col3:
+                sort_by = st.selectbox("Sort by", ["Business Name", "created_at", "status"] if 'created_at' in st.session_state.leads_df.columns else ["Business Name"])
+            with col4:
+                st.form_submit_button("🔍 Search")
         
+        # Apply filters (display-only view, no defensive copy needed)
+        filtered_df = st.session_state.leads_df
+
         if search_term:
-            mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False, na=False)).any(axis=1)
+            # Plain substring scan over one precomputed column instead of a
+            # regex pass over a string-coerced copy of every column
+            blob = build_search_blob(st.session_state.leads_df)
+            mask = blob.loc[filtered_df.index].str.contains(search_term.lower(), regex=False, na=False)
             filtered_df = filtered_df[mask]
         
         if status_filter != "All":
             filtered_df = filtered_df[filtered_df['status'] == status_filter]
         
-        # Display leads with CRUD operations
+        # Display leads as a single selectable table instead of one
+        # expander + buttons per row; the detail panel below renders
+        # widgets only for the selected lead
         if not filtered_df.empty:
             st.write(f"Showing {len(filtered_df)} of {len(st.session_state.leads_df)} leads")
-            
-            for idx, row in filtered_df.iterrows():
-                with st.expander(f"🏢 {row.get('Business Name', 'Unknown Business')} - {row.get('status', 'Unknown')}"):
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    
-                    with col1:
-                        st.write(f"**Address:** {row.get('Address', 'N/A')}")
-                        st.write(f"**Phone:** {row.get('Phone', 'N/A')}")
-                        st.write(f"**Website:** {row.get('Website', 'N/A')}")
-                        st.write(f"**Emails:** {row.get('Found Emails', 'N/A')}")
-                        if 'created_at' in row:
-                            st.write(f"**Created:** {row['created_at']}")
-                    
-                    with col2:
-                        if st.button(f"✏️ Edit", key=f"edit_{idx}"):
-                            st.session_state.edit_mode = True
-                            st.session_state.edit_index = idx
-                            st.session_state.show_add_form = False
-                            st.rerun()
-                    
-                    with col3:
-                        if st.button(f"🗑️ Delete", key=f"delete_{idx}"):
-                            st.session_state.leads_df = st.session_state.leads_df.drop(idx).reset_index(drop=True)
+
+            event = st.dataframe(
+                _preview_view(filtered_df, PREVIEW_COLS + ['status', 'created_at']),
+                use_container_width=True,
+                hide_index=True,
+                on_select='rerun',
+                selection_mode='single-row',
+                key='leads_table',
+            )
+
+            if event.selection.rows:
+                idx = filtered_df.index[event.selection.rows[0]]
+                row = filtered_df.loc[idx]
+                # Key widgets on the immutable lead id, not the positional
+                # index, so deletes don't churn other rows' widget state
+                lead_key = row.get('id') if pd.notna(row.get('id')) else idx
+                st.markdown(f"#### 🏢 {row.get('Business Name', 'Unknown Business')} - {row.get('status', 'Unknown')}")
+                col1, col2, col3 = st.columns([3, 1, 1])
+
+                with col1:
+                    st.write(f"**Address:** {row.get('Address', 'N/A')}")
+                    st.write(f"**Phone:** {row.get('Phone', 'N/A')}")
+                    st.write(f"**Website:** {row.get('Website', 'N/A')}")
+                    st.write(f"**Emails:** {row.get('Found Emails', 'N/A')}")
+                    if 'created_at' in row:
+                        st.write(f"**Created:** {row['created_at']}")
+
+                with col2:
+                    if st.button(f"✏️ Edit", key=f"edit_{lead_key}"):
+                        st.session_state.edit_mode = True
+                        st.session_state.edit_index = idx
+                        st.session_state.show_add_form = False
+                        st.rerun()
+
+                with col3:
+                    if st.button(f"🗑️ Delete", key=f"delete_{lead_key}"):
+                        lead_id = row.get('id')
+                        st.session_state._lead_key_set.discard((row.get('Business Name'), row.get('Address')))
+                        # Keep the original index: widget keys no longer
+                        # depend on positions, so no need to renumber rows
+                        st.session_state.leads_df = st.session_state.leads_df.drop(idx)
+                        bump_df_version()
+                        if pd.notna(lead_id) and lead_id:
+                            append_lead_event('delete', {'id': lead_id})
+                        else:
+                            # Legacy row without an id: fall back to a full save
                             save_leads_to_file(st.session_state.leads_df)
-                            st.success("Lead deleted!")
-                            st.rerun()
+                        st.success("Lead deleted!")
+                        st.rerun()
         
         # Bulk operations
         st.divider()
         col1, col2, col3 = st.columns(3)
         with col1:
-            if st.button("📥 Export All to CSV"):
-                csv = convert_df_to_csv(st.session_state.leads_df)
-                st.download_button(
-                    label="📄 Download CSV",
-                    data=csv,
-                    file_name=f'leads_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                    mime='text/csv',
-                )
+            # Render the download directly; the cached CSV encode only
+            # reruns when the leads change
+            st.download_button(
+                label="📥 Export All to CSV",
+                data=convert_df_to_csv(st.session_state.leads_df),
+                file_name=f'leads_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                mime='text/csv',
+            )
         
         with col2:
             if st.button("🗑️ Clear All Leads"):
                 if st.session_state.get('confirm_clear'):
                     st.session_state.leads_df = pd.DataFrame()
+                    st.session_state._lead_key_set = set()
+                    bump_df_version()
                     save_leads_to_file(st.session_state.leads_df)
                     st.session_state.confirm_clear = False
                     st.success("All leads cleared!")
@@ -248,7 +622,10 @@ if st.session_state.show_add_form or st.session_state.edit_mode:
     
     if st.session_state.edit_mode:
         st.subheader("✏️ Edit Lead")
-        lead_data = st.session_state.leads_df.iloc[st.session_state.edit_index]
+        # edit_index is an index label, not a position: after a delete the
+        # two diverge (deletes keep original labels), so .loc matches the
+        # label-based row write below
+        lead_data = st.session_state.leads_df.loc[st.session_state.edit_index]
     else:
         st.subheader("➕ Add New Lead")
         lead_data = {}
@@ -264,8 +641,8 @@ if st.session_state.show_add_form or st.session_state.edit_mode:
         with col2:
             website = st.text_input("Website", value=lead_data.get('Website', ''))
             emails = st.text_input("Emails", value=lead_data.get('Found Emails', ''))
-            status = st.selectbox("Status", ["New", "Contacted", "Qualified", "Converted", "Rejected"], 
-                                index=["New", "Contacted", "Qualified", "Converted", "Rejected"].index(lead_data.get('status', 'New')) if lead_data.get('status') in ["New", "Contacted", "Qualified", "Converted", "Rejected"] else 0)
+            status = st.selectbox("Status", STATUS_OPTIONS,
+                                index=STATUS_OPTIONS.index(lead_data.get('status')) if lead_data.get('status') in STATUS_OPTIONS else 0)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -288,25 +665,36 @@ if st.session_state.show_add_form or st.session_state.edit_mode:
                 'Website': website,
                 'Found Emails': emails,
                 'status': status,
-                'created_at': lead_data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'created_at': lead_data.get('created_at', pd.Timestamp.now()),
+                'updated_at': pd.Timestamp.now()
             }
             
             if st.session_state.edit_mode:
-                # Update existing lead
-                for key, value in new_lead.items():
-                    st.session_state.leads_df.at[st.session_state.edit_index, key] = value
+                # Update existing lead with a single vectorized row write
+                st.session_state.leads_df.loc[st.session_state.edit_index, list(new_lead.keys())] = list(new_lead.values())
+                # Re-derive primary_email/primary_email_valid: the send
+                # paths read the precomputed columns, which would otherwise
+                # keep pointing at the pre-edit address
+                ensure_status_dtype(st.session_state.leads_df)
+                st.session_state._lead_key_set.discard((lead_data.get('Business Name'), lead_data.get('Address')))
+                st.session_state._lead_key_set.add((business_name, address))
+                bump_df_version()
                 st.success("Lead updated successfully!")
             else:
-                # Add new lead
-                if st.session_state.leads_df.empty:
-                    st.session_state.leads_df = pd.DataFrame([new_lead])
-                else:
-                    st.session_state.leads_df = pd.concat([st.session_state.leads_df, pd.DataFrame([new_lead])], ignore_index=True)
+                # Buffer the insert instead of copying the whole DataFrame;
+                # readers flush the buffer with a single concat
+                st.session_state.pending_leads_buffer.append(new_lead)
+                st.session_state._lead_key_set.add((business_name, address))
                 st.success("New lead added successfully!")
-            
-            # Save to file
-            save_leads_to_file(st.session_state.leads_df)
+
+            # Log the change instead of rewriting the whole database
+            if st.session_state.edit_mode:
+                if pd.notna(lead_data.get('id')):
+                    append_lead_event('update', new_lead)
+                else:
+                    save_leads_to_file(st.session_state.leads_df)
+            else:
+                append_lead_event('add', new_lead)
             
             # Reset form state
             st.session_state.show_add_form = False
@@ -315,8 +703,11 @@ if st.session_state.show_add_form or st.session_state.edit_mode:
             st.rerun()
 
 with tab3:
+    from ai_outreach import configure_gemini, generate_bulk_outreach, save_outreach_messages
+
     st.subheader("🤖 AI-Powered Outreach Generation")
-    
+    flush_pending_leads()
+
     # Gemini API Key Configuration
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -355,8 +746,9 @@ with tab3:
                     selected_leads = available_leads
                     st.info(f"Selected all {len(selected_leads)} leads for AI outreach")
                 else:
-                    # Multi-select for individual leads
-                    lead_options = [f"{row['Business Name']} - {row.get('status', 'New')}" for _, row in available_leads.iterrows()]
+                    # Multi-select for individual leads (vectorized + cached
+                    # instead of an iterrows pass per rerun)
+                    lead_options = get_lead_options(available_leads)
                     selected_indices = st.multiselect(
                         "Select leads for outreach:",
                         options=range(len(lead_options)),
@@ -399,27 +791,30 @@ with tab3:
                                                 st.info(f"**{angle}**: {count} leads")
                                     
                                     st.success(f"✅ Generated personalized outreach for {len(outreach_results)} leads!")
-                                    
-                                    # Save results to session state for display
-                                    if 'outreach_messages' not in st.session_state:
-                                        st.session_state.outreach_messages = pd.DataFrame()
-                                    
-                                    # Merge new messages with existing ones
-                                    if st.session_state.outreach_messages.empty:
-                                        st.session_state.outreach_messages = outreach_results
-                                    else:
-                                        st.session_state.outreach_messages = pd.concat([st.session_state.outreach_messages, outreach_results], ignore_index=True)
-                                    
+
+                                    # Buffer the batch; readers materialize
+                                    # all pending batches with one concat
+                                    st.session_state._outreach_chunks.append(outreach_results)
+                                    flush_outreach_chunks()
+
                                     # Save to file
                                     save_outreach_messages(st.session_state.outreach_messages)
                                     
-                                    # Update lead status to "Contacted"
-                                    for idx in selected_leads.index:
-                                        st.session_state.leads_df.at[idx, 'status'] = 'Contacted'
-                                        st.session_state.leads_df.at[idx, 'updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    
-                                    # Save updated leads
-                                    save_leads_to_file(st.session_state.leads_df)
+                                    # Update lead status to "Contacted" in one vectorized write
+                                    now = pd.Timestamp.now()
+                                    idxs = selected_leads.index
+                                    st.session_state.leads_df.loc[idxs, 'status'] = 'Contacted'
+                                    st.session_state.leads_df.loc[idxs, 'updated_at'] = now
+                                    bump_df_version()
+
+                                    # Log the status changes
+                                    if 'id' in st.session_state.leads_df.columns and st.session_state.leads_df.loc[idxs, 'id'].notna().all():
+                                        append_lead_events('status_change', [
+                                            {'id': lead_id, 'status': 'Contacted', 'updated_at': now}
+                                            for lead_id in st.session_state.leads_df.loc[idxs, 'id']
+                                        ])
+                                    else:
+                                        save_leads_to_file(st.session_state.leads_df)
                                     
                                     st.rerun()
                                 else:
@@ -429,27 +824,25 @@ with tab3:
                                 st.error(f"Error generating outreach: {e}")
             
             # Display generated outreach messages
-            if 'outreach_messages' in st.session_state and not st.session_state.outreach_messages.empty:
+            flush_outreach_chunks()
+            if not st.session_state.outreach_messages.empty:
                 st.divider()
                 st.subheader("📧 Generated Outreach Messages")
                 
                 # Analytics overview
                 messages_df = st.session_state.outreach_messages
                 if 'confidence_score' in messages_df.columns:
+                    metrics = compute_outreach_metrics(messages_df)
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        avg_confidence = messages_df['confidence_score'].mean()
-                        st.metric("Overall Confidence", f"{avg_confidence:.1f}/10")
+                        st.metric("Overall Confidence", f"{metrics['avg_conf']:.1f}/10")
                     with col2:
-                        high_quality = len(messages_df[messages_df['confidence_score'] >= 8])
-                        st.metric("High Quality Messages", f"{high_quality}/{len(messages_df)}")
+                        st.metric("High Quality Messages", f"{metrics['high_quality']}/{len(messages_df)}")
                     with col3:
-                        avg_email_words = messages_df.get('word_count_email', pd.Series([0])).mean()
-                        st.metric("Avg Email Length", f"{avg_email_words:.0f} words")
+                        st.metric("Avg Email Length", f"{metrics['avg_email_words']:.0f} words")
                     with col4:
                         if 'personalization_angle' in messages_df.columns:
-                            unique_strategies = messages_df['personalization_angle'].nunique()
-                            st.metric("Strategy Variety", f"{unique_strategies} types")
+                            st.metric("Strategy Variety", f"{metrics['unique_strategies']} types")
                 
                 # Search and filter outreach messages
                 col1, col2 = st.columns([2, 1])
@@ -459,97 +852,111 @@ with tab3:
                     sort_options = ["generated_at", "business_name", "confidence_score"]
                     sort_outreach = st.selectbox("Sort by", sort_options, key="sort_outreach")
                 
-                # Apply filters
-                filtered_outreach = st.session_state.outreach_messages.copy()
+                # Filter first so the sort only touches the matching slice
+                filtered_outreach = st.session_state.outreach_messages
                 if search_outreach:
-                    mask = filtered_outreach['business_name'].str.contains(search_outreach, case=False, na=False)
+                    if '_business_name_lower' in filtered_outreach.columns:
+                        mask = filtered_outreach['_business_name_lower'].str.contains(search_outreach.lower(), regex=False, na=False)
+                    else:
+                        mask = filtered_outreach['business_name'].str.contains(search_outreach, case=False, na=False, regex=False)
                     filtered_outreach = filtered_outreach[mask]
-                
-                # Sort messages
                 filtered_outreach = filtered_outreach.sort_values(sort_outreach, ascending=False)
                 
-                # Display messages
-                for idx, message in filtered_outreach.iterrows():
-                    # Create title with confidence indicator
+                # Display messages as one selectable table; the editing
+                # widgets render only for the selected message
+                summary_cols = [c for c in ['business_name', 'confidence_score', 'personalization_angle', 'word_count_email', 'word_count_linkedin', 'generated_at'] if c in filtered_outreach.columns]
+                outreach_event = st.dataframe(
+                    filtered_outreach[summary_cols],
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select='rerun',
+                    selection_mode='single-row',
+                    key='outreach_table',
+                )
+
+                if outreach_event.selection.rows:
+                    idx = filtered_outreach.index[outreach_event.selection.rows[0]]
+                    message = filtered_outreach.loc[idx]
+                    # Messages carry no id column; business_name is stable
+                    # per lead and survives re-sorts and deletions
+                    msg_key = message.get('business_name', idx)
                     confidence = message.get('confidence_score', 5)
                     confidence_emoji = "🎯" if confidence >= 8 else "⚡" if confidence >= 6 else "📝"
-                    title = f"{confidence_emoji} {message['business_name']} - Confidence: {confidence}/10"
-                    
-                    with st.expander(title):
-                        # Analytics row
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            st.metric("Confidence", f"{confidence}/10")
-                        with col2:
-                            st.metric("Email Words", message.get('word_count_email', 0))
-                        with col3:
-                            st.metric("LinkedIn Words", message.get('word_count_linkedin', 0))
-                        with col4:
-                            st.write("**Strategy:**")
-                            st.write(message.get('personalization_angle', 'Unknown'))
-                        
-                        st.divider()
-                        
-                        # Messages
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.subheader("📧 Email Message")
-                            if 'email_subject' in message and message['email_subject']:
-                                st.text_input(
-                                    "Subject Line:",
-                                    value=message['email_subject'],
-                                    key=f"ai_subject_{idx}",
-                                    help="Email subject line"
-                                )
-                            st.text_area(
-                                "Email Body:",
-                                value=message['email_body'],
-                                height=120,
-                                key=f"email_{idx}",
-                                help="Copy this message for your email outreach"
-                            )
-                        
-                        with col2:
-                            st.subheader("💼 LinkedIn Message")
-                            st.text_area(
-                                "LinkedIn DM:",
-                                value=message['linkedin_dm'],
-                                height=150,
-                                key=f"linkedin_{idx}",
-                                help="Copy this message for LinkedIn outreach"
+                    st.markdown(f"#### {confidence_emoji} {message['business_name']} - Confidence: {confidence}/10")
+
+                    # Analytics row
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Confidence", f"{confidence}/10")
+                    with col2:
+                        st.metric("Email Words", message.get('word_count_email', 0))
+                    with col3:
+                        st.metric("LinkedIn Words", message.get('word_count_linkedin', 0))
+                    with col4:
+                        st.write("**Strategy:**")
+                        st.write(message.get('personalization_angle', 'Unknown'))
+
+                    st.divider()
+
+                    # Messages
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.subheader("📧 Email Message")
+                        if 'email_subject' in message and message['email_subject']:
+                            st.text_input(
+                                "Subject Line:",
+                                value=message['email_subject'],
+                                key=f"ai_subject_{msg_key}",
+                                help="Email subject line"
                             )
-                        
-                        # Copy buttons and quality indicator
-                        col1, col2, col3 = st.columns([1, 1, 2])
-                        with col1:
-                            if st.button(f"📋 Copy Email", key=f"copy_email_{idx}"):
-                                st.write("Email copied to display above ↑")
-                        with col2:
-                            if st.button(f"📋 Copy LinkedIn", key=f"copy_linkedin_{idx}"):
-                                st.write("LinkedIn message copied to display above ↑")
-                        with col3:
-                            quality_color = "green" if confidence >= 8 else "orange" if confidence >= 6 else "red"
-                            quality_text = "High Quality" if confidence >= 8 else "Good Quality" if confidence >= 6 else "Basic Quality"
-                            st.markdown(f":{quality_color}[{quality_text}]")
+                        st.text_area(
+                            "Email Body:",
+                            value=message['email_body'],
+                            height=120,
+                            key=f"email_{msg_key}",
+                            help="Copy this message for your email outreach"
+                        )
+
+                    with col2:
+                        st.subheader("💼 LinkedIn Message")
+                        st.text_area(
+                            "LinkedIn DM:",
+                            value=message['linkedin_dm'],
+                            height=150,
+                            key=f"linkedin_{msg_key}",
+                            help="Copy this message for LinkedIn outreach"
+                        )
+
+                    # Copy buttons and quality indicator
+                    col1, col2, col3 = st.columns([1, 1, 2])
+                    with col1:
+                        if st.button(f"📋 Copy Email", key=f"copy_email_{msg_key}"):
+                            st.write("Email copied to display above ↑")
+                    with col2:
+                        if st.button(f"📋 Copy LinkedIn", key=f"copy_linkedin_{msg_key}"):
+                            st.write("LinkedIn message copied to display above ↑")
+                    with col3:
+                        quality_color = "green" if confidence >= 8 else "orange" if confidence >= 6 else "red"
+                        quality_text = "High Quality" if confidence >= 8 else "Good Quality" if confidence >= 6 else "Basic Quality"
+                        st.markdown(f":{quality_color}[{quality_text}]")
                 
                 # Bulk operations for outreach
                 st.divider()
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    if st.button("📥 Export Outreach Messages"):
-                        csv_outreach = st.session_state.outreach_messages.to_csv(index=False)
-                        st.download_button(
-                            label="📄 Download Outreach CSV",
-                            data=csv_outreach,
-                            file_name=f'outreach_messages_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                            mime='text/csv',
-                        )
+                    st.download_button(
+                        label="📥 Export Outreach Messages",
+                        data=export_outreach_csv(st.session_state.outreach_messages),
+                        file_name=f'outreach_messages_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                        mime='text/csv',
+                    )
                 
                 with col2:
                     if st.button("🗑️ Clear All Messages"):
                         if st.session_state.get('confirm_clear_outreach'):
                             st.session_state.outreach_messages = pd.DataFrame()
+                            bump_outreach_version()
                             st.session_state.confirm_clear_outreach = False
                             st.success("All outreach messages cleared!")
                             st.rerun()
@@ -559,7 +966,8 @@ with tab3:
 
 with tab4:
     st.subheader("📊 Lead Analytics")
-    
+    flush_pending_leads()
+
     if st.session_state.leads_df.empty:
         st.info("No data available for analytics. Generate some leads first!")
     else:
@@ -570,28 +978,35 @@ with tab4:
         
         with col2:
             if 'status' in st.session_state.leads_df.columns:
-                conversion_rate = len(st.session_state.leads_df[st.session_state.leads_df['status'] == 'Converted']) / len(st.session_state.leads_df) * 100
+                # Equality on the categorical column compares int8 codes
+                conversion_rate = (st.session_state.leads_df['status'] == 'Converted').mean() * 100
                 st.metric("Conversion Rate", f"{conversion_rate:.1f}%")
         
         with col3:
             if 'created_at' in st.session_state.leads_df.columns:
-                today_leads = len(st.session_state.leads_df[st.session_state.leads_df['created_at'].str.contains(datetime.now().strftime('%Y-%m-%d'))])
+                # One vectorized datetime64 compare instead of a per-row
+                # string scan
+                today = pd.Timestamp.today().normalize()
+                today_leads = int((st.session_state.leads_df['created_at'].dt.normalize() == today).sum())
                 st.metric("Today's Leads", today_leads)
         
         # Status distribution chart
         if 'status' in st.session_state.leads_df.columns:
             st.subheader("Lead Status Distribution")
-            status_counts = st.session_state.leads_df['status'].value_counts()
-            st.bar_chart(status_counts)
+            st.bar_chart(get_status_counts(st.session_state.leads_df))
         
         # Recent activity
         if 'created_at' in st.session_state.leads_df.columns:
             st.subheader("Recent Leads")
             recent_leads = st.session_state.leads_df.sort_values('created_at', ascending=False).head(5)
-            st.dataframe(recent_leads[['Business Name', 'status', 'created_at']], use_container_width=True)
+            st.dataframe(_preview_view(recent_leads, ['Business Name', 'status', 'created_at']), use_container_width=True)
 
 with tab5:
+    from email_sender import format_email_content
+
     st.subheader("📧 Human-in-the-Loop Email & LinkedIn Management")
+    flush_pending_leads()
+    flush_outreach_chunks()
     st.markdown("Review and send AI-generated messages manually for complete control over your outreach.")
     
     # SendGrid API Key Configuration
@@ -615,14 +1030,12 @@ with tab5:
     if 'outreach_messages' not in st.session_state or st.session_state.outreach_messages.empty:
         st.info("📝 No outreach messages available. Please generate AI outreach messages first in the 'AI Outreach' tab.")
     else:
-        # Filter leads that have outreach messages and are ready for human review
-        outreach_df = st.session_state.outreach_messages.copy()
-        
-        # Add a column to track email sent status if it doesn't exist
-        if 'email_sent' not in outreach_df.columns:
-            outreach_df['email_sent'] = False
-            st.session_state.outreach_messages['email_sent'] = False
-        
+        # Work directly on the session-state frame: nothing below mutates
+        # it except through session state itself, so there is no reason to
+        # deep-copy the whole DataFrame on every keystroke. The email_sent
+        # column is maintained in flush_outreach_chunks.
+        outreach_df = st.session_state.outreach_messages
+
         # Filter options
         col1, col2, col3 = st.columns([2, 1, 1])
         with col1:
@@ -632,37 +1045,146 @@ with tab5:
         with col3:
             sort_hitl = st.selectbox("Sort by", ["generated_at", "business_name"], key="hitl_sort")
         
-        # Apply filters
-        filtered_hitl = outreach_df.copy()
-        
+        # Apply filters: combine search and status into one boolean mask
+        # and take a single .loc pass instead of three chained copies
+        mask = np.ones(len(outreach_df), dtype=bool)
         if search_hitl:
-            mask = filtered_hitl['business_name'].str.contains(search_hitl, case=False, na=False)
-            filtered_hitl = filtered_hitl[mask]
-        
-        if status_filter_hitl == "Email Not Sent":
-            filtered_hitl = filtered_hitl[filtered_hitl['email_sent'] == False]
-        elif status_filter_hitl == "Email Sent":
-            filtered_hitl = filtered_hitl[filtered_hitl['email_sent'] == True]
-        
-        # Sort
-        filtered_hitl = filtered_hitl.sort_values(sort_hitl, ascending=False)
+            if '_business_name_lower' in outreach_df.columns:
+                mask &= outreach_df['_business_name_lower'].str.contains(search_hitl.lower(), regex=False, na=False).to_numpy()
+            else:
+                mask &= outreach_df['business_name'].str.contains(search_hitl, case=False, na=False).to_numpy()
+        if status_filter_hitl != "All":
+            # eval goes through numexpr when it is available, evaluating
+            # the comparison in one C pass without intermediate Series;
+            # the substring search above stays as str.contains, which
+            # query/eval cannot express
+            want_sent = status_filter_hitl == "Email Sent"
+            mask &= outreach_df.eval("email_sent == @want_sent").to_numpy()
+
+        # Mergesort is stable and fast on the mostly-sorted message list
+        filtered_hitl = outreach_df.loc[mask].sort_values(sort_hitl, ascending=False, kind='mergesort')
         
         if filtered_hitl.empty:
             st.info("No leads match your current filters.")
         else:
             st.write(f"Showing {len(filtered_hitl)} leads with draft messages")
             
-            # Initialize email sender
-            email_sender = EmailSender(sendgrid_api_key) if sendgrid_api_key else None
-            
-            # Display each lead with action buttons
-            for idx, lead in filtered_hitl.iterrows():
-                # Find corresponding lead data for email
+            # Initialize email sender (memoized per API key)
+            email_sender = get_email_sender(sendgrid_api_key) if sendgrid_api_key else None
+
+            # One name -> row-index map instead of a boolean scan over the
+            # leads DataFrame for every draft
+            if 'Business Name' in st.session_state.leads_df.columns:
+                name_to_idx = {_bn_key(name): i for i, name in st.session_state.leads_df['Business Name'].items()}
+            else:
+                name_to_idx = {}
+
+            # Bulk send: collect every pending draft with a usable recipient
+            # and dispatch them in one concurrent batch
+            pending_mask = outreach_df['email_sent'] == False
+            pending_count = int(pending_mask.sum())
+            if st.button(f"📨 Send All Pending ({pending_count})", disabled=not sendgrid_api_key or pending_count == 0):
+                bulk_messages = []
+                bulk_rows = []
+                # Plain dicts per row instead of iterrows' per-row Series
+                for lead in outreach_df.loc[pending_mask].reset_index().to_dict('records'):
+                    idx = lead['index']
+                    lead_idx = name_to_idx.get(_bn_key(lead['business_name']))
+                    if lead_idx is None:
+                        continue
+                    lead_row = st.session_state.leads_df.loc[lead_idx]
+                    if not lead_row.get('primary_email_valid', False):
+                        continue
+                    recipient = lead_row['primary_email']
+                    bulk_messages.append({
+                        'to_email': recipient,
+                        'subject': f"Business Growth Opportunity for {lead['business_name']}",
+                        'html_content': format_email_content(lead['business_name'], lead['email_body']),
+                        'from_email': from_email,
+                    })
+                    bulk_rows.append((idx, lead_idx, recipient))
+
+                if not bulk_messages:
+                    st.warning("No pending drafts have a recipient email address.")
+                else:
+                    # Fan the batch out on the long-lived executor so sends
+                    # overlap their network wait; EmailSender's token bucket
+                    # still caps the request rate. The status box ticks as
+                    # each future lands instead of freezing on one blocking
+                    # call.
+                    executor = get_send_executor()
+                    futures = [
+                        executor.submit(
+                            email_sender.send_email,
+                            to_email=m['to_email'],
+                            subject=m['subject'],
+                            html_content=m['html_content'],
+                            from_email=m['from_email'],
+                        )
+                        for m in bulk_messages
+                    ]
+                    with st.status(f"📧 Sending {len(futures)} emails...") as send_status:
+                        for done, _ in enumerate(as_completed(futures), start=1):
+                            send_status.update(label=f"📧 Sending emails... {done}/{len(futures)}")
+                        send_status.update(label=f"📧 Sent {len(futures)} emails", state="complete")
+                    # Results collected in submit order to line up with bulk_rows
+                    results = [f.result() for f in futures]
+
+                    # One clock read for the whole batch: every log line
+                    # and updated_at stamp shares it, which also keeps the
+                    # batch contiguous when sorting by time
+                    batch_ts = datetime.now().isoformat(timespec='seconds')
+                    now = pd.Timestamp.now()
+
+                    sent_msg_idx = []
+                    sent_lead_idx = []
+                    for (idx, lead_idx, recipient), message, result in zip(bulk_rows, bulk_messages, results):
+                        email_sender.log_email_activity(
+                            lead_id=st.session_state.leads_df.at[lead_idx, 'id'] if 'id' in st.session_state.leads_df.columns else 'unknown',
+                            to_email=recipient,
+                            subject=message['subject'],
+                            status="success" if result['success'] else "failed",
+                            message=result['message'],
+                            timestamp=batch_ts
+                        )
+                        if result['success']:
+                            sent_msg_idx.append(idx)
+                            sent_lead_idx.append(lead_idx)
+
+                    sent_count = len(sent_msg_idx)
+                    if sent_msg_idx:
+                        # Mark the whole batch with one assignment per
+                        # column rather than three .at writes per message
+                        st.session_state.outreach_messages.loc[sent_msg_idx, 'email_sent'] = True
+                        st.session_state.leads_df.loc[sent_lead_idx, 'status'] = 'Contacted'
+                        st.session_state.leads_df.loc[sent_lead_idx, 'updated_at'] = now
+
+                    bump_outreach_version()
+                    bump_df_version()
+                    mark_leads_dirty()
+                    st.success(f"✅ Sent {sent_count}/{len(bulk_messages)} emails")
+                    st.rerun()
+
+            # Paginate so a rerun only materializes one page of expanders
+            # and text areas instead of the full filtered list
+            page_size = 20
+            total_pages = max(1, -(-len(filtered_hitl) // page_size))
+            if total_pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="hitl_page")
+            else:
+                page = 1
+            page_hitl = filtered_hitl.iloc[(page - 1) * page_size:page * page_size]
+
+            # Display each lead with action buttons; rows come out as plain
+            # dicts ('index' holds the original DataFrame label) so the loop
+            # avoids boxing every row into a Series
+            for lead in page_hitl.reset_index().to_dict('records'):
+                idx = lead['index']
+                # Find corresponding lead data for email (O(1) map lookup)
                 lead_data = None
-                if not st.session_state.leads_df.empty:
-                    matching_leads = st.session_state.leads_df[st.session_state.leads_df['Business Name'] == lead['business_name']]
-                    if not matching_leads.empty:
-                        lead_data = matching_leads.iloc[0]
+                lead_row_idx = name_to_idx.get(_bn_key(lead['business_name']))
+                if lead_row_idx is not None:
+                    lead_data = st.session_state.leads_df.loc[lead_row_idx]
                 
                 # Create expander for each lead
                 status_icon = "✅" if lead.get('email_sent', False) else "📧"
@@ -713,18 +1235,18 @@ with tab5:
                     
                     # Send Email Button
                     with col1:
-                        email_disabled = not sendgrid_api_key or lead_data is None or not lead_data.get('Found Emails')
+                        email_disabled = not sendgrid_api_key or lead_data is None or not lead_data.get('primary_email_valid', False)
                         send_button_text = "📧 Send Email"
                         if lead.get('email_sent', False):
                             send_button_text = "✅ Email Sent"
                             email_disabled = True
                         
                         if st.button(send_button_text, key=f"send_{idx}", disabled=email_disabled):
-                            if email_sender and lead_data is not None and lead_data.get('Found Emails'):
-                                recipient_email = lead_data['Found Emails'].split(',')[0].strip()  # Use first email if multiple
+                            if email_sender and lead_data is not None and lead_data.get('primary_email_valid', False):
+                                recipient_email = lead_data['primary_email']  # First address, precomputed on load
                                 
                                 # Format email content
-                                html_content = format_email_content(lead_data, email_content)
+                                html_content = format_email_content(lead['business_name'], email_content)
                                 
                                 # Send email
                                 result = email_sender.send_email(
@@ -747,13 +1269,14 @@ with tab5:
                                     st.success(f"✅ Email sent successfully to {recipient_email}")
                                     # Mark as sent in the dataframe
                                     st.session_state.outreach_messages.at[idx, 'email_sent'] = True
+                                    bump_outreach_version()
                                     
                                     # Update lead status
-                                    lead_idx = st.session_state.leads_df[st.session_state.leads_df['Business Name'] == lead['business_name']].index
-                                    if not lead_idx.empty:
-                                        st.session_state.leads_df.at[lead_idx[0], 'status'] = 'Contacted'
-                                        st.session_state.leads_df.at[lead_idx[0], 'updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                        save_leads_to_file(st.session_state.leads_df)
+                                    if lead_row_idx is not None:
+                                        st.session_state.leads_df.at[lead_row_idx, 'status'] = 'Contacted'
+                                        st.session_state.leads_df.at[lead_row_idx, 'updated_at'] = pd.Timestamp.now()
+                                        bump_df_version()
+                                        mark_leads_dirty()
                                     
                                     st.rerun()
                                 else:
@@ -774,11 +1297,11 @@ with tab5:
                     with col3:
                         if st.button("❌ Reject", key=f"reject_{idx}"):
                             # Update lead status to rejected
-                            lead_idx = st.session_state.leads_df[st.session_state.leads_df['Business Name'] == lead['business_name']].index
-                            if not lead_idx.empty:
-                                st.session_state.leads_df.at[lead_idx[0], 'status'] = 'Rejected'
-                                st.session_state.leads_df.at[lead_idx[0], 'updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                save_leads_to_file(st.session_state.leads_df)
+                            if lead_row_idx is not None:
+                                st.session_state.leads_df.at[lead_row_idx, 'status'] = 'Rejected'
+                                st.session_state.leads_df.at[lead_row_idx, 'updated_at'] = pd.Timestamp.now()
+                                bump_df_version()
+                                mark_leads_dirty()
                                 st.success(f"Lead {lead['business_name']} marked as rejected")
                                 st.rerun()
                     
@@ -786,19 +1309,22 @@ with tab5:
                     with col4:
                         if st.button("👁️ Preview", key=f"preview_{idx}"):
                             if lead_data is not None:
-                                html_preview = format_email_content(lead_data, email_content)
+                                html_preview = format_email_content(lead['business_name'], email_content)
                                 st.components.v1.html(html_preview, height=400, scrolling=True)
         
-        # Statistics
+        # Statistics: one vectorized reduction over the sent flags instead
+        # of materializing a filtered DataFrame just to take its length
         st.divider()
         col1, col2, col3, col4 = st.columns(4)
-        
+
+        sent_col = outreach_df['email_sent'].to_numpy(dtype=bool)
+
         with col1:
-            total_messages = len(outreach_df)
+            total_messages = sent_col.size
             st.metric("Total Messages", total_messages)
-        
+
         with col2:
-            sent_emails = len(outreach_df[outreach_df.get('email_sent', False) == True])
+            sent_emails = int(sent_col.sum())
             st.metric("Emails Sent", sent_emails)
         
         with col3:
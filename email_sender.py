@@ -1,22 +1,86 @@
+import functools
+import html
 import json
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
-import streamlit as st
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free"""
+
+    def __init__(self, rate=10, capacity=20):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 class EmailSender:
-    def __init__(self, api_key=None):
+    # SendGrid statuses worth retrying: rate limit and transient 5xx
+    _RETRIABLE_STATUS = (429, 500, 502, 503)
+
+    LOG_FILE = "email_log.jsonl"
+    # Shared across instances so concurrent send_bulk threads can't
+    # interleave log lines
+    _log_lock = threading.Lock()
+
+    def __init__(self, api_key=None, rate=10, capacity=20):
         """Initialize EmailSender with SendGrid API key"""
         self.api_key = api_key
+        self._bucket = TokenBucket(rate=rate, capacity=capacity)
         if self.api_key:
             self.sg = SendGridAPIClient(api_key=self.api_key)
         else:
             self.sg = None
+
+    def _observe_rate_headers(self, response):
+        """Back off proactively when SendGrid reports an empty window"""
+        try:
+            headers = dict(response.headers)
+            if int(headers.get('X-RateLimit-Remaining', 1)) <= 0:
+                delay = float(headers.get('X-RateLimit-Reset', 0)) - time.time()
+                if delay > 0:
+                    time.sleep(min(delay, 30))
+        except Exception:
+            pass
+
+    def _send_with_retry(self, message, max_attempts=5):
+        """Rate-limited send with jittered exponential backoff on 429/5xx"""
+        for attempt in range(max_attempts):
+            self._bucket.acquire()
+            try:
+                response = self.sg.send(message)
+                self._observe_rate_headers(response)
+                return response
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                if status in self._RETRIABLE_STATUS and attempt < max_attempts - 1:
+                    delay = min(2 ** attempt + random.random(), 30)
+                    logger.warning(f"SendGrid returned {status}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                raise
     
     def send_email(self, to_email, subject, html_content, from_email="noreply@leadgenius.com", from_name="LeadGenius"):
         """
@@ -46,8 +110,8 @@ class EmailSender:
                 html_content=html_content
             )
             
-            response = self.sg.send(message)
-            
+            response = self._send_with_retry(message)
+
             logger.info(f"Email sent successfully to {to_email}")
             return {
                 "success": True,
@@ -62,19 +126,61 @@ class EmailSender:
                 "message": f"Failed to send email: {str(e)}"
             }
     
-    def log_email_activity(self, lead_id, to_email, subject, status, message=""):
+    def _send_one(self, message):
+        """Send a single message dict (used by the send_bulk pool)"""
+        return self.send_email(
+            to_email=message['to_email'],
+            subject=message['subject'],
+            html_content=message['html_content'],
+            from_email=message.get('from_email', 'noreply@leadgenius.com'),
+            from_name=message.get('from_name', 'LeadGenius')
+        )
+
+    def send_bulk(self, messages, max_workers=20, batch_size=200):
+        """
+        Send many emails concurrently via a thread pool
+
+        Each message carries its own per-recipient HTML, so the sends fan
+        out over threads (the work is network-bound) instead of being
+        packed into one Mail with shared content.
+
+        Args:
+            messages: list of dicts with to_email, subject, html_content
+                and optional from_email/from_name
+            max_workers: thread pool size
+            batch_size: messages submitted to the pool per batch
+
+        Returns:
+            list: one send_email result dict per message, in input order
+        """
+        if not self.sg:
+            return [{
+                "success": False,
+                "message": "SendGrid API key not configured"
+            } for _ in messages]
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for start in range(0, len(messages), batch_size):
+                batch = messages[start:start + batch_size]
+                results.extend(pool.map(self._send_one, batch))
+        return results
+
+    def log_email_activity(self, lead_id, to_email, subject, status, message="", timestamp=None):
         """
         Log email activity to a file for tracking
-        
+
         Args:
             lead_id: ID of the lead
             to_email: Recipient email
             subject: Email subject
             status: success/failed
             message: Additional message or error details
+            timestamp: Precomputed ISO timestamp; batch callers pass one
+                shared value instead of paying a clock read per entry
         """
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(timespec='seconds'),
             "lead_id": lead_id,
             "to_email": to_email,
             "subject": subject,
@@ -83,35 +189,19 @@ class EmailSender:
         }
         
         try:
-            # Load existing log or create new one
-            try:
-                with open("email_log.json", "r") as f:
-                    email_log = json.load(f)
-            except FileNotFoundError:
-                email_log = []
-            
-            # Add new entry
-            email_log.append(log_entry)
-            
-            # Save updated log
-            with open("email_log.json", "w") as f:
-                json.dump(email_log, f, indent=2)
-                
+            # Append one JSON line instead of rewriting the whole log file;
+            # read back elsewhere with pd.read_json(..., lines=True)
+            with self._log_lock:
+                with open(self.LOG_FILE, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(log_entry) + "\n")
+
         except Exception as e:
             logger.error(f"Failed to log email activity: {str(e)}")
 
-def format_email_content(lead_data, email_message):
-    """
-    Format the email content with proper HTML styling
-    
-    Args:
-        lead_data: Lead information
-        email_message: The AI-generated email message
-    
-    Returns:
-        str: Formatted HTML email content
-    """
-    html_content = f"""
+# Static halves of the email template, built once at import time. The
+# body uses white-space: pre-line so the browser renders the message's
+# newlines and no <br> substitution pass is needed.
+_HEADER_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -119,55 +209,75 @@ def format_email_content(lead_data, email_message):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Business Opportunity</title>
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 line-height: 1.6;
                 color: #333;
                 max-width: 600px;
                 margin: 0 auto;
                 padding: 20px;
-            }}
-            .header {{
+            }
+            .header {
                 border-bottom: 2px solid #007bff;
                 padding-bottom: 10px;
                 margin-bottom: 20px;
-            }}
-            .content {{
+            }
+            .content {
                 margin-bottom: 20px;
-            }}
-            .footer {{
+                white-space: pre-line;
+            }
+            .footer {
                 font-size: 12px;
                 color: #666;
                 border-top: 1px solid #eee;
                 padding-top: 10px;
                 margin-top: 20px;
-            }}
-            .signature {{
+            }
+            .signature {
                 margin-top: 20px;
                 font-weight: bold;
-            }}
+            }
         </style>
     </head>
     <body>
         <div class="header">
             <h2>Business Growth Opportunity</h2>
         </div>
-        
+
         <div class="content">
-            {email_message.replace(chr(10), '<br>')}
+"""
+
+_FOOTER_HTML = """
         </div>
-        
+
         <div class="signature">
             Best regards,<br>
             LeadGenius Team
         </div>
-        
+
         <div class="footer">
             <p>This email was sent from LeadGenius lead generation system.</p>
             <p>If you don't wish to receive further communications, please reply with "UNSUBSCRIBE".</p>
         </div>
     </body>
     </html>
+"""
+
+@functools.lru_cache(maxsize=4096)
+def format_email_content(business_name, email_message):
     """
-    
-    return html_content 
\ No newline at end of file
+    Format the email content with proper HTML styling
+
+    Memoized on (business_name, email_message) so the preview and send
+    branches - and retries within a bulk batch - share one rendered
+    string. lru_cache hands back the cached str directly, where
+    st.cache_data would pickle-copy the payload on every hit.
+
+    Args:
+        business_name: Business the draft is addressed to
+        email_message: The AI-generated email message
+
+    Returns:
+        str: Formatted HTML email content
+    """
+    return _HEADER_HTML + html.escape(email_message) + _FOOTER_HTML
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import re
+import threading
+
+# Persistent template cache for structurally similar outreach messages.
+#
+# Prompts for e.g. "Italian restaurant in Austin" and "Italian restaurant in
+# Houston" share almost all of their structure, and the hot path is a full
+# Gemini round-trip. Generated messages are stored as templates keyed on
+# (business type, state, contact-title bucket) with the company name and city
+# swapped for placeholders, so near-duplicate leads are served locally with a
+# string substitution instead of another API call.
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "outreach_template_cache.json"
+
+_STATE_RE = re.compile(r'\b([A-Z]{2})\b')
+
+# Coarse buckets so e.g. "Owner" and "Founder" share templates
+_TITLE_BUCKETS = {
+    'owner': ('owner', 'founder', 'partner', 'principal'),
+    'executive': ('ceo', 'cfo', 'cto', 'cmo', 'president', 'director', 'vp'),
+    'manager': ('manager', 'lead', 'head'),
+}
+
+def _title_bucket(title):
+    """Maps a free-form job title onto a coarse seniority bucket."""
+    title = (title or '').lower()
+    for bucket, words in _TITLE_BUCKETS.items():
+        if any(word in title for word in words):
+            return bucket
+    return 'other'
+
+def _city_and_state(location):
+    """Best-effort split of a 'Denver, CO'-style address string."""
+    location = location or ''
+    match = _STATE_RE.search(location)
+    state = match.group(1) if match else ''
+    city = location.split(',')[0].strip()
+    return city, state
+
+def make_cache_key(profile):
+    """Builds the (business type, state, title bucket) key for a profile."""
+    business_type = (profile.get('business_type') or '').strip().lower()
+    _, state = _city_and_state(profile.get('location'))
+    bucket = _title_bucket((profile.get('key_person') or {}).get('title'))
+    return f"{business_type}|{state}|{bucket}"
+
+class OutreachTemplateCache:
+    """Exact-key template cache with JSON file persistence."""
+
+    _FIELDS = ('email_subject', 'email_body', 'linkedin_dm')
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._templates = {}
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    self._templates = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load outreach template cache: {e}")
+            self._templates = {}
+
+    def get(self, profile):
+        """Returns cached messages adapted to this profile, or None on miss."""
+        entry = self._templates.get(make_cache_key(profile))
+        if entry is None:
+            return None
+
+        company = profile.get('company_name') or 'your business'
+        city, _ = _city_and_state(profile.get('location'))
+        filled = {}
+        for field in self._FIELDS:
+            text = entry.get(field, '')
+            text = text.replace('{company_name}', company)
+            text = text.replace('{city}', city or 'your city')
+            filled[field] = text
+        filled['personalization_angle'] = 'Served from template cache'
+        filled['confidence_score'] = entry.get('confidence_score', 6)
+        return filled
+
+    def put(self, profile, messages):
+        """Stores generated messages as a template with placeholders."""
+        company = profile.get('company_name') or ''
+        city, _ = _city_and_state(profile.get('location'))
+        entry = {'confidence_score': messages.get('confidence_score', 5)}
+        for field in self._FIELDS:
+            text = messages.get(field, '')
+            if company:
+                text = text.replace(company, '{company_name}')
+            if city:
+                text = text.replace(city, '{city}')
+            entry[field] = text
+
+        with self._lock:
+            self._templates[make_cache_key(profile)] = entry
+            try:
+                with open(self.path, 'w') as f:
+                    json.dump(self._templates, f, indent=2)
+            except Exception as e:
+                logger.warning(f"Could not save outreach template cache: {e}")